@@ -1,9 +1,10 @@
+import functools
 import os
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional
 from dotenv import load_dotenv
 
-load_dotenv()
-
 # Project root directory (where config.py resides)
 PROJECT_ROOT = Path(__file__).parent.parent
 
@@ -11,9 +12,39 @@ PROJECT_ROOT = Path(__file__).parent.parent
 PLUGIN_CONFIG_PATH = (PROJECT_ROOT / "config" / "plugin_config.yml").resolve()
 
 
+# Environment variables read by the application, resolved once. Defaults live at the call sites.
+_ENV_KEYS = (
+    "DB_HOST",
+    "DB_USER",
+    "DB_PASS",
+    "DB_NAME",
+    "DB_TABLE_NAME",
+    "DB_POOL_MAX",
+    "GCP_PROJECT_ID",
+    "GCP_LOCATION",
+    "GCP_CORPUS_NAME",
+    "APP_WORKERS",
+    "RAG_MAX_INFLIGHT",
+    "RAG_MAX_RPS",
+)
+
+
+@functools.cache
+def _env() -> Mapping[str, Optional[str]]:
+    """Loads .env once and freezes the values of _ENV_KEYS"""
+    load_dotenv()
+    return MappingProxyType({key: os.environ.get(key) for key in _ENV_KEYS})
+
+
+def _get_env(key: str) -> Optional[str]:
+    env = _env()
+    # Keys outside _ENV_KEYS are read from the environment directly
+    return env[key] if key in env else os.environ.get(key)
+
+
 def get_required_env(key: str) -> str:
     """Get required environment variable or raise error"""
-    value = os.getenv(key)
+    value = _get_env(key)
     if not value:
         raise ValueError(f"Required environment variable {key} is not set")
     return value
@@ -21,7 +52,8 @@ def get_required_env(key: str) -> str:
 
 def get_env_with_default(key: str, default: str) -> str:
     """Get env variable with default"""
-    return os.getenv(key, default)
+    value = _get_env(key)
+    return default if value is None else value
 
 
 # Document version tracking
@@ -30,6 +62,7 @@ DB_USER = get_required_env("DB_USER")
 DB_PASS = get_required_env("DB_PASS")
 DB_NAME = get_required_env("DB_NAME")
 DB_TABLE_NAME = get_env_with_default("DB_TABLE_NAME", "file_tracker")
+DB_POOL_MAX = int(get_env_with_default("DB_POOL_MAX", "10"))
 
 
 # Corpus settings
@@ -41,4 +74,12 @@ CORPUS_NAME = get_required_env("GCP_CORPUS_NAME")
 if not CORPUS_NAME.startswith("projects/"):
     raise ValueError(f"Invalid CORPUS_NAME format: {CORPUS_NAME}")
 
+
+# Size of the process-wide thread pool shared by plugin runs, imports and uploads
+APP_WORKERS = int(get_env_with_default("APP_WORKERS", str((os.cpu_count() or 4) * 4)))
+
+# Client-side limits for Vertex AI RAG calls (RAG_MAX_RPS <= 0 disables rate limiting)
+RAG_MAX_INFLIGHT = int(get_env_with_default("RAG_MAX_INFLIGHT", "16"))
+RAG_MAX_RPS = float(get_env_with_default("RAG_MAX_RPS", "5"))
+
 print("✅ Configuration validated successfully")
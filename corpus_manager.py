@@ -1,19 +1,23 @@
 from vertexai import rag
 import vertexai
-from config.config import PROJECT_ID, CORPUS_NAME, LOCATION
+from config.config import PROJECT_ID, CORPUS_NAME, LOCATION, RAG_MAX_INFLIGHT, RAG_MAX_RPS
 import logging
 import socket  # For ConnectionError
-from typing import Union, List
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Union, List, Optional, Dict, Iterator, Any
 
 # Retry logic for transient failures
 try:
     from tenacity import (
         retry,
         stop_after_attempt,
-        wait_exponential,
+        wait_exponential_jitter,
         retry_if_exception_type,
     )
-    from google.api_core.exceptions import GoogleAPIError
+    from google.api_core.exceptions import GoogleAPIError, ResourceExhausted
 
     TENACITY_AVAILABLE = True
 except ImportError:
@@ -30,23 +34,151 @@ except ImportError:
     def stop_after_attempt(n):
         return None
 
-    def wait_exponential(**kwargs):
+    def wait_exponential_jitter(**kwargs):
         return None
 
     def retry_if_exception_type(exception_types):
         return None
 
     GoogleAPIError = Exception
+    ResourceExhausted = Exception
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# vertexai.init only has to run once per process
+_vertexai_initialized = False
+_vertexai_init_lock = threading.Lock()
+
+
+def init_vertexai() -> None:
+    """Initializes Vertex AI exactly once per process; later calls return immediately."""
+    global _vertexai_initialized
+    if _vertexai_initialized:
+        return
+
+    with _vertexai_init_lock:
+        if not _vertexai_initialized:
+            vertexai.init(
+                project=PROJECT_ID,
+                location=LOCATION,
+            )
+            _vertexai_initialized = True
+            # Listing the corpora is a Vertex AI round-trip, only pay it when it is logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("CORPUSES: %s", list(rag.list_corpora()))
+
+
+class _RateLimiter:
+    """Token bucket allowing at most `rate` acquisitions per second on average."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a token is available. A non-positive rate disables limiting."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Client-side governor for Vertex AI RAG calls, keeps us clear of 429 backoff
+_rag_semaphore = threading.BoundedSemaphore(RAG_MAX_INFLIGHT)
+_rate_limiter = _RateLimiter(RAG_MAX_RPS)
+
+
+@contextmanager
+def _rag_call_slot():
+    """Holds an in-flight slot and a rate limiter token for the duration of a RAG call."""
+    with _rag_semaphore:
+        _rate_limiter.acquire()
+        yield
+
+
+# display_name -> resource name of the CORPUS_NAME files seen so far, kept in sync on writes
+_files_index: Dict[str, str] = {}
+_files_listing_done = False
+_files_index_lock = threading.Lock()
+# Pages of the rag.list_files listing, consumed only as far as lookups need
+# them. Advanced by one thread at a time, under _files_listing_lock.
+_files_pages: Optional[Iterator[Any]] = None
+_files_listing_lock = threading.Lock()
+
+
+def _next_files_page() -> Optional[Any]:
+    """Fetches the next page of the corpus listing, None once it is exhausted."""
+    global _files_pages
+
+    with _rag_call_slot():
+        try:
+            if _files_pages is None:
+                logger.info("Listing files in corpus '%s'...", CORPUS_NAME)
+                _files_pages = iter(rag.list_files(corpus_name=CORPUS_NAME).pages)
+            return next(_files_pages, None)
+        except Exception:
+            # A failed page fetch leaves the pager unusable, the next lookup
+            # (e.g. the upload retry) lists the corpus again from the start
+            _files_pages = None
+            raise
+
+
+def _find_file(file_name: str) -> Optional[str]:
+    """
+    Returns the resource name of the corpus file with the given display name, or None.
+
+    The corpus listing is shared by all lookups of the process and read lazily:
+    a lookup stops at the page of the first match, so later pages are only
+    fetched on a miss. The index lock is never held across a page fetch.
+    """
+    global _files_listing_done
+
+    with _files_index_lock:
+        if file_name in _files_index:
+            return _files_index[file_name]
+        if _files_listing_done:
+            return None
+
+    # Lookups that miss the index wait here for the thread fetching a page,
+    # then check the index again before fetching the next one themselves
+    with _files_listing_lock:
+        while True:
+            with _files_index_lock:
+                if file_name in _files_index:
+                    return _files_index[file_name]
+                if _files_listing_done:
+                    return None
+
+            page = _next_files_page()
+
+            with _files_index_lock:
+                if page is None:
+                    _files_listing_done = True
+                    return None
+                for file in page.rag_files:
+                    _files_index.setdefault(file.display_name, file.name)
+
 
 @retry(
     stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10),
-    retry=retry_if_exception_type((GoogleAPIError, ConnectionError)),
+    wait=wait_exponential_jitter(initial=4, max=10),
+    retry=retry_if_exception_type((GoogleAPIError, ConnectionError, ResourceExhausted)),
     reraise=True,
 )
 def upload_file(file_names: List[str], local_paths: List[str]) -> List[str]:
@@ -65,47 +197,61 @@ def upload_file(file_names: List[str], local_paths: List[str]) -> List[str]:
         raise ValueError("The number of file names and local paths must be the same.")
 
     try:
-        # Initialize Vertex AI
-        vertexai.init(
-            project=PROJECT_ID,
-            location=LOCATION,
-        )
-
-        logger.info(f"CORPUSES: {rag.list_corpora()}")
-
-        # Fetch existing files once to avoid multiple API calls
-        logger.info(f"Listing files in corpus '{CORPUS_NAME}'...")
-        existing_files = {
-            file.display_name: file.name for file in rag.list_files(corpus_name=CORPUS_NAME)
-        }
+        # No-op when main() already initialized Vertex AI
+        init_vertexai()
 
         uploaded_file_ids = []
 
         for file_name, local_path in zip(file_names, local_paths):
             # Check if file exists and delete it
-            if file_name in existing_files:
-                resource_name = existing_files[file_name]
+            resource_name = _find_file(file_name)
+            if resource_name:
                 logger.info(
-                    f"Found existing file '{file_name}' (Resource Name: {resource_name}). Deleting..."
+                    "Found existing file '%s' (Resource Name: %s). Deleting...",
+                    file_name,
+                    resource_name,
                 )
-                rag.delete_file(name=resource_name)
-                logger.info(f"Deleted existing file '{file_name}'.")
+                with _rag_call_slot():
+                    rag.delete_file(name=resource_name)
+                with _files_index_lock:
+                    _files_index.pop(file_name, None)
+                logger.info("Deleted existing file '%s'.", file_name)
 
             # Upload the new file
-            logger.info(f"Uploading '{local_path}' as '{file_name}'...")
-            rag_file = rag.upload_file(
-                corpus_name=CORPUS_NAME,
-                path=local_path,
-                display_name=file_name,
-                description="Uploaded via RAG Document Loader",
-            )
+            logger.info("Uploading '%s' as '%s'...", local_path, file_name)
+            with _rag_call_slot():
+                rag_file = rag.upload_file(
+                    corpus_name=CORPUS_NAME,
+                    path=local_path,
+                    display_name=file_name,
+                    description="Uploaded via RAG Document Loader",
+                )
 
-            logger.info(f"Successfully uploaded file: {rag_file.name}")
+            logger.info("Successfully uploaded file: %s", rag_file.name)
             if rag_file.name:
+                with _files_index_lock:
+                    _files_index[file_name] = rag_file.name
                 uploaded_file_ids.append(rag_file.name)
 
         return uploaded_file_ids
 
     except Exception as e:
-        logger.error(f"An error occurred during file upload: {e}")
+        logger.error("An error occurred during file upload: %s", e)
         raise
+
+
+def upload_file_async(
+    file_names: List[str], local_paths: List[str], executor: Executor
+) -> Future:
+    """
+    Schedules upload_file in the background, so the caller can move on to its next document.
+
+    Args:
+        file_names (List[str]): The display name(s) of the file(s) in the corpus.
+        local_paths (List[str]): The local path(s) to the file(s) to upload.
+        executor (Executor): Pool to run the upload on, e.g. the application's thread pool.
+
+    Returns:
+        Future: Resolves to the list of resource names returned by upload_file.
+    """
+    return executor.submit(upload_file, file_names, local_paths)
@@ -1,77 +1,279 @@
-import psycopg2
+from psycopg2 import extensions
 from psycopg2 import sql
+from psycopg2 import pool
+from psycopg2.extras import execute_values
 import datetime
+import threading
 from contextlib import contextmanager
+from typing import Dict, Iterable, List
+
+
+class _TrackerConnection(extensions.connection):
+    """Pooled connection remembering whether the tracker statements are prepared on it"""
+
+    prepared = False
+
+
+class _TrackerPool(pool.ThreadedConnectionPool):
+    """Connection pool that opens connections on demand but keeps them.
+
+    Only minconn connections are opened up front. The base pool closes every
+    returned connection beyond minconn, so the next checkout would reconnect
+    and prepare the statements again; this one keeps up to maxconn idle.
+    """
+
+    def _putconn(self, conn, key=None, close=False):
+        # minconn is only read by the base _putconn, which runs under the pool lock
+        minconn = self.minconn
+        self.minconn = self.maxconn
+        try:
+            super()._putconn(conn, key, close)
+        finally:
+            self.minconn = minconn
+
+
+def pending_schema_changes(cursor, table_name: str) -> List[sql.Composed]:
+    """Returns the DDL still needed to bring the tracker table to its current schema.
+
+    A TIMESTAMPTZ `tracker` column, so reads return native datetimes, and a
+    unique `filename`, which the ON CONFLICT upserts rely on. Only runs
+    catalog queries; an up to date table yields an empty list.
+    """
+    table = sql.Identifier(table_name)
+    cursor.execute("SELECT to_regclass(quote_ident(%s))", (table_name,))
+    if cursor.fetchone()[0] is None:
+        return [
+            sql.SQL(
+                "CREATE TABLE {} (filename TEXT PRIMARY KEY, tracker TIMESTAMPTZ)"
+            ).format(table)
+        ]
+
+    changes = []
+    cursor.execute(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = %s "
+        "AND column_name = 'tracker'",
+        (table_name,),
+    )
+    result = cursor.fetchone()
+    if result and result[0] != "timestamp with time zone":
+        changes.append(
+            sql.SQL(
+                "ALTER TABLE {} ALTER COLUMN tracker TYPE TIMESTAMPTZ "
+                "USING tracker::timestamptz"
+            ).format(table)
+        )
+    cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM pg_index i "
+        "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0] "
+        "WHERE i.indrelid = to_regclass(quote_ident(%s)) AND i.indisunique "
+        "AND i.indpred IS NULL AND i.indnatts = 1 AND a.attname = 'filename')",
+        (table_name,),
+    )
+    if not cursor.fetchone()[0]:
+        changes.append(
+            sql.SQL("CREATE UNIQUE INDEX {} ON {} (filename)").format(
+                sql.Identifier(f"{table_name}_filename_key"), table
+            )
+        )
+    return changes
 
 
 class FileVersionTracker:
+    # Server-side prepared statements, created once per pooled connection
+    _PREPARED_STATEMENTS = {
+        "fvt_select_version": "SELECT tracker FROM {} WHERE filename = $1",
+        "fvt_upsert_version": (
+            "INSERT INTO {} (filename, tracker) VALUES ($1, NOW()) "
+            "ON CONFLICT (filename) DO UPDATE SET tracker = EXCLUDED.tracker "
+            "RETURNING tracker"
+        ),
+    }
+
     def __init__(self, config):
         self.config = config
         # Handle both dict and module config
-        if hasattr(config, "DB_TABLE_NAME"):
-            self.table_name = config.DB_TABLE_NAME
-        else:
-            self.table_name = config.get("DB_TABLE_NAME", "file_tracker")
-
-    @contextmanager
-    def get_connection(self):
-        # Handle both dict and module config
-        if hasattr(self.config, "DB_HOST"):
+        if hasattr(config, "DB_HOST"):
             # config is a module
-            db_host = self.config.DB_HOST
-            db_user = self.config.DB_USER
-            db_pass = self.config.DB_PASS
-            db_name = self.config.DB_NAME
+            self.table_name = getattr(config, "DB_TABLE_NAME", "file_tracker")
+            db_host = config.DB_HOST
+            db_user = config.DB_USER
+            db_pass = config.DB_PASS
+            db_name = config.DB_NAME
+            db_pool_max = getattr(config, "DB_POOL_MAX", 10)
         else:
             # config is a dict
-            db_host = self.config.get("DB_HOST")
-            db_user = self.config.get("DB_USER")
-            db_pass = self.config.get("DB_PASS")
-            db_name = self.config.get("DB_NAME")
+            self.table_name = config.get("DB_TABLE_NAME", "file_tracker")
+            db_host = config.get("DB_HOST")
+            db_user = config.get("DB_USER")
+            db_pass = config.get("DB_PASS")
+            db_name = config.get("DB_NAME")
+            db_pool_max = config.get("DB_POOL_MAX", 10)
 
-        conn = psycopg2.connect(
-            host=db_host, user=db_user, password=db_pass, database=db_name
+        # Kept so the pool can be rebuilt after the tracker is pickled into a worker process
+        self._pool_kwargs = dict(
+            minconn=1,
+            maxconn=int(db_pool_max),
+            host=db_host,
+            user=db_user,
+            password=db_pass,
+            database=db_name,
+            connection_factory=_TrackerConnection,
         )
+        self._pool = _TrackerPool(**self._pool_kwargs)
+        # getconn raises PoolError instead of waiting once maxconn connections are
+        # checked out, so callers beyond the pool size wait for a slot here
+        self._connection_slots = threading.BoundedSemaphore(self._pool_kwargs["maxconn"])
+        # Last versions known in this process, keyed by filename. Filled by
+        # lookups and writes, so repeated checks skip the database
+        self._cache: Dict[str, datetime.datetime | None] = {}
+
+        self.init_schema()
+
+    def __getstate__(self):
+        # Connections can not cross process boundaries, the copy opens its own
+        # pool on first use. A config module can not be pickled either.
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["config"] = None
+        del state["_connection_slots"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._connection_slots = threading.BoundedSemaphore(self._pool_kwargs["maxconn"])
+
+    def _get_pool(self) -> _TrackerPool:
+        if self._pool is None:
+            self._pool = _TrackerPool(**self._pool_kwargs)
+        return self._pool
+
+    def init_schema(self) -> None:
+        """Checks that the tracker table has the schema the queries rely on.
+
+        Read-only, so startup takes no locks on the table; the DDL lives in
+        migrate_tracker_schema.py. Runs on a raw pooled connection: the
+        prepared statements must only be created once the column has its
+        final type.
+        """
+        conn = self._get_pool().getconn()
         try:
-            yield conn
+            with conn.cursor() as cursor:
+                pending = pending_schema_changes(cursor, self.table_name)
+            conn.rollback()
         finally:
-            conn.close()
+            self._pool.putconn(conn)
+
+        if pending:
+            raise RuntimeError(
+                f"Table {self.table_name!r} is not migrated, "
+                "run `python migrate_tracker_schema.py` first"
+            )
+
+    @contextmanager
+    def get_connection(self):
+        with self._connection_slots:
+            conn = self._get_pool().getconn()
+            try:
+                if not conn.prepared:
+                    self._prepare_statements(conn)
+                yield conn
+            finally:
+                self._pool.putconn(conn)
+
+    def _prepare_statements(self, conn: _TrackerConnection) -> None:
+        """PREPAREs the tracker queries so the server parses and plans them only once.
+
+        All statements go to the server in a single round trip.
+        """
+        table = sql.Identifier(self.table_name)
+        statements = sql.SQL("; ").join(
+            sql.SQL("PREPARE {} AS " + statement).format(sql.Identifier(name), table)
+            for name, statement in self._PREPARED_STATEMENTS.items()
+        )
+        with conn.cursor() as cursor:
+            cursor.execute(statements)
+        conn.commit()
+        conn.prepared = True
+
+    def close(self) -> None:
+        """Closes every pooled database connection."""
+        if self._pool is not None and not self._pool.closed:
+            self._pool.closeall()
+
+    def invalidate(self, filename: str | None = None) -> None:
+        """Drops the cached version of the file, or of every file when none is given."""
+        if filename is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(filename, None)
 
     def get_last_version(self, filename: str) -> datetime.datetime | None:
+        if filename in self._cache:
+            return self._cache[filename]
+
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
-                query = sql.SQL("SELECT tracker FROM {} WHERE filename = %s").format(
-                    sql.Identifier(self.table_name)
-                )
-                cursor.execute(query, (filename,))
+                cursor.execute("EXECUTE fvt_select_version (%s)", (filename,))
                 result = cursor.fetchone()
-                return (
-                    datetime.datetime.fromisoformat(result[0].replace("Z", "+00:00"))
-                    if result
-                    else None
-                )
+                last_version = result[0] if result else None
+        self._cache[filename] = last_version
+        return last_version
+
+    def set_last_version(self, filename: str, version: str) -> datetime.datetime:
+        """Upserts the tracker row of the file and returns the stored timestamp."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("EXECUTE fvt_upsert_version (%s)", (filename,))
+                tracker = cursor.fetchone()[0]
+                conn.commit()
+        self._cache[filename] = tracker
+        return tracker
+
+    def set_last_versions(self, filenames: Iterable[str]) -> None:
+        """Upserts the tracker rows of several files in a single statement."""
+        # ON CONFLICT DO UPDATE can not touch the same row twice in one statement
+        filenames = list(dict.fromkeys(filenames))
+        if not filenames:
+            return
 
-    def set_last_version(self, filename: str, version: str) -> None:
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
                 query = sql.SQL(
-                    "UPDATE {} SET tracker = NOW() WHERE filename = %s"
+                    "INSERT INTO {} (filename, tracker) VALUES %s "
+                    "ON CONFLICT (filename) DO UPDATE SET tracker = EXCLUDED.tracker "
+                    "RETURNING filename, tracker"
                 ).format(sql.Identifier(self.table_name))
-                cursor.execute(query, (filename,))
+                rows = execute_values(
+                    cursor,
+                    query.as_string(conn),
+                    [(f,) for f in filenames],
+                    template="(%s, NOW())",
+                    page_size=len(filenames),
+                    fetch=True,
+                )
                 conn.commit()
+        self._cache.update({row[0]: row[1] for row in rows})
 
-    def is_new_version_available(
-        self, filename: str, new_version_timestamp_str: str
-    ) -> bool:
+    def is_current(self, filename: str, version_timestamp_str: str) -> bool:
+        """Tells whether the tracked version of the file is at least as new as
+        the given timestamp. The tracked version is read once and cached, so
+        later checks of the file compare in Python."""
         try:
-            new_version_timestamp = datetime.datetime.fromisoformat(
-                new_version_timestamp_str.replace("Z", "+00:00")
-            )
-            last_version = self.get_last_version(filename)
+            version = datetime.datetime.fromisoformat(version_timestamp_str)
+        except (ValueError, TypeError) as e:
+            raise RuntimeError(f"The given timestamp string is not valid: {e}")
 
-            if last_version is None:
-                return True
+        last_version = self.get_last_version(filename)
+        if last_version is None:
+            return False
+        if version.tzinfo is None:
+            # Postgres reads a naive timestamp in the session time zone, the
+            # zone TIMESTAMPTZ values are returned in
+            version = version.replace(tzinfo=last_version.tzinfo)
+        return last_version >= version
 
-            return new_version_timestamp > last_version
-        except Exception as e:
-            raise RuntimeError(f"The given timestamp string is not valid: {e}")
+    def is_new_version_available(
+        self, filename: str, new_version_timestamp_str: str
+    ) -> bool:
+        return not self.is_current(filename, new_version_timestamp_str)
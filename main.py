@@ -1,61 +1,141 @@
+import atexit
+import functools
 import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from plugin_loader import PluginLoader
-from plugins.document_loader_plugin import DocumentLoaderPlugin
+from plugins.document_loader_plugin import PluginResult
 from file_version_tracker import FileVersionTracker
 import config.config as config
-from corpus_manager import upload_file
+from corpus_manager import init_vertexai, upload_file_async
+
+logger = logging.getLogger(__name__)
+
+# Temp files waiting for deletion, drained by the janitor thread. None stops it.
+_cleanup_queue: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+
+
+def _cleanup_worker() -> None:
+    """Deletes queued temp files off the critical path until the None sentinel arrives"""
+    for file_path in iter(_cleanup_queue.get, None):
+        try:
+            Path(file_path).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Could not delete temp file %s: %s", file_path, e)
+
+
+def _schedule_upload(result: PluginResult, executor: Executor) -> Tuple[Optional[Future], List[str], List[str]]:
+    """
+    Schedules the upload of the files of a plugin result on the given executor.
+
+    Returns the upload future (None if there is nothing to upload),
+    the file names whose version tracker has to be updated after the upload
+    and the temp files to delete once it succeeded.
+    """
+
+    logger.info("Plugin Result: %s", result)
+
+    if result.success == False:
+        return None, [], []
+
+    if not result.file_paths:
+        return None, [], []
+
+    file_names = result.display_names
+    file_paths = result.file_paths
+    last_updates = result.metadata.get('last_updates', [])
+
+    if isinstance(file_names, str):
+        file_names = [file_names]
+    if isinstance(file_paths, str):
+        file_paths = [file_paths]
+
+    # The upload overlaps with the remaining plugins' work
+    upload_future = upload_file_async(file_names, file_paths, executor=executor)
+
+    return upload_future, file_names[:len(last_updates)], file_paths
+
 
 def main():
 
     # Configure logging
     logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
+
+    # One pool for plugin runs, plugin imports and uploads, shut down at exit
+    app_pool = ThreadPoolExecutor(max_workers=config.APP_WORKERS, thread_name_prefix='rag')
+    atexit.register(app_pool.shutdown)
 
     file_version_tracker = FileVersionTracker(config=config)
-    plugin_loader = PluginLoader(plugin_config=config.PLUGIN_CONFIG_PATH, file_version_tracker=file_version_tracker)
+    atexit.register(file_version_tracker.close)
+    plugin_loader = PluginLoader(plugin_config=config.PLUGIN_CONFIG_PATH, file_version_tracker=file_version_tracker, executor=app_pool)
     plugins = plugin_loader.load_plugins()
 
-    for plugin_name in plugins:
+    # Initialize Vertex AI once up front instead of on the first upload thread
+    init_vertexai()
+
+    cleanup_thread = threading.Thread(target=_cleanup_worker, name="temp-file-janitor", daemon=True)
+    cleanup_thread.start()
+
+    uploads: Dict[Future, Tuple[str, List[str], List[str]]] = {}
+
+    # Plugins are independent: I/O bound ones overlap their network latency on the
+    # thread pool, CPU bound ones get their own processes
+    cpu_plugins = [
+        plugin_name for plugin_name, plugin_context in plugins.items()
+        if not plugin_context['plugin_instance'].io_bound
+    ]
+    process_pool = None
+    if cpu_plugins:
+        # spawn, forking next to the running pool threads could deadlock the children
+        process_pool = ProcessPoolExecutor(
+            max_workers=min(len(cpu_plugins), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=functools.partial(logging.basicConfig, level=logging.INFO),
+        )
+
+    futures = {
+        (process_pool if plugin_name in cpu_plugins else app_pool).submit(
+            plugin_context['plugin_instance'].run
+        ): plugin_name
+        for plugin_name, plugin_context in plugins.items()
+    }
+
+    for future in as_completed(futures):
+        plugin_name = futures[future]
+        try:
+            upload_future, tracked_file_names, file_paths = _schedule_upload(future.result(), app_pool)
+            if upload_future is not None:
+                uploads[upload_future] = (plugin_name, tracked_file_names, file_paths)
+        except Exception as e:
+            logger.error("Error in plugin %s: %s", plugin_name, e)
+
+    if process_pool is not None:
+        process_pool.shutdown()
+
+    for upload_future in as_completed(uploads):
+        plugin_name, tracked_file_names, file_paths = uploads[upload_future]
         try:
-            plugin_context = plugins[plugin_name]
-            plugin_instance:DocumentLoaderPlugin = plugin_context['plugin_instance']
-            plugin_config = plugin_context['config']
-            
-            result = plugin_instance.run()
-            logger.info(f"Plugin Result: {result}")
-
-            if result.success == False:
-                continue
-            
-            if result.file_paths:
-
-                file_names = result.display_names
-                file_paths = result.file_paths
-                last_updates = result.metadata.get('last_updates', [])
-
-                if isinstance(file_names, str):
-                    file_names = [file_names]
-                if isinstance(file_paths, str):
-                    file_paths = [file_paths]
-
-                corpus_results = upload_file(file_names, file_paths)
-                logger.info(f'The files {file_names} have been uploaded to the corpus. ids: {corpus_results}')
-
-                for i, file_name in enumerate(file_names):
-                    if i < len(last_updates):
-                        file_version_tracker.set_last_version(file_name, last_updates[i])
-                    
-                    # deleting the temp file
-                    if i < len(file_paths):
-                        path = Path(file_paths[i])
-                        path.unlink(missing_ok=True)
+            corpus_results = upload_future.result()
+            logger.info('The files of plugin %s have been uploaded to the corpus. ids: %s', plugin_name, corpus_results)
 
+            # deleting the temp files, off the critical path
+            for file_path in file_paths:
+                _cleanup_queue.put(str(file_path))
 
+            file_version_tracker.set_last_versions(tracked_file_names)
         except Exception as e:
-            print(f"Error: {e}")
+            logger.error("Error in plugin %s: %s", plugin_name, e)
+
+    # Let the janitor finish the queued deletions
+    _cleanup_queue.put(None)
+    cleanup_thread.join()
 
     
 if __name__ == "__main__":
     
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+One-off migration of the file tracker table.
+
+Creates the table when it is missing, converts a text `tracker` column to
+TIMESTAMPTZ and adds the unique index on `filename`. Safe to run again, an up
+to date table is left untouched. Run it before deploying a loader that
+expects the new schema; the loader itself only checks it.
+"""
+
+import logging
+
+import psycopg2
+
+import config.config as config
+from file_version_tracker import pending_schema_changes
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    conn = psycopg2.connect(
+        host=config.DB_HOST,
+        user=config.DB_USER,
+        password=config.DB_PASS,
+        database=config.DB_NAME,
+    )
+    try:
+        with conn.cursor() as cursor:
+            changes = pending_schema_changes(cursor, config.DB_TABLE_NAME)
+            for statement in changes:
+                logger.info("Running: %s", statement.as_string(cursor))
+                cursor.execute(statement)
+        conn.commit()
+    finally:
+        conn.close()
+
+    if changes:
+        logger.info("Table '%s' migrated.", config.DB_TABLE_NAME)
+    else:
+        logger.info("Table '%s' is up to date.", config.DB_TABLE_NAME)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,21 @@
 import importlib
+import os
 import yaml
 import pprint
 import logging
 
-from typing import Dict, Any, List
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# LibYAML's C parser when PyYAML was built with it, the pure Python one otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@dataclass(frozen=True, slots=True)
 class PluginConfig:
     """ Data class for the pllugin configuration instances"""
     name: str
@@ -20,9 +25,14 @@ class PluginConfig:
 
 class PluginLoader:
 
-    def __init__(self, plugin_config:str, file_version_tracker:Any):
+    # Parsed plugin configurations keyed by (path, st_mtime_ns, st_size)
+    _config_cache: Dict[Tuple[str, int, int], List[PluginConfig]] = {}
+
+    def __init__(self, plugin_config:str, file_version_tracker:Any, executor:Optional[Executor] = None):
         self.plugin_config_path = plugin_config
         self.file_version_tracker = file_version_tracker
+        # Shared pool for the parallel module imports, a private one is used if not given
+        self.executor = executor
 
         self.plugin_configs: List[PluginConfig] = []
         self.loaded_plugins: Dict[str, Any] = {}
@@ -34,8 +44,16 @@ class PluginLoader:
     def load_config(self):
 
         try:
+            st = os.stat(self.plugin_config_path)
+            cache_key = (str(self.plugin_config_path), st.st_mtime_ns, st.st_size)
+            cached = PluginLoader._config_cache.get(cache_key)
+            if cached is not None:
+                self.plugin_configs = list(cached)
+                logger.info("Using cached configuration for %d plugins", len(self.plugin_configs))
+                return
+
             with open(self.plugin_config_path, 'r') as config_file:
-                config_data = yaml.safe_load(config_file)
+                config_data = yaml.load(config_file, Loader=_YAML_LOADER)
                 #logger.info(pprint.pp(config_data))
 
             self.plugin_configs = [
@@ -47,23 +65,48 @@ class PluginLoader:
                 )
                 for plugin in config_data.get('plugins', [])
             ]
-            logger.info(f"Loaded configuration for {len(self.plugin_configs)} plugins")
-            logger.info(self.plugin_configs)
+            PluginLoader._config_cache[cache_key] = list(self.plugin_configs)
+            logger.info("Loaded configuration for %d plugins", len(self.plugin_configs))
+            logger.debug("Plugin configurations: %s", self.plugin_configs)
         except FileNotFoundError:
-            logger.error(f"Configuration file can not be fould: {self.config_path}")
+            logger.error("Configuration file can not be fould: %s", self.plugin_config_path)
             raise
         except yaml.YAMLError as e:
-            logger.error(f"YAML parsing error: {e}")
+            logger.error("YAML parsing error: %s", e)
             raise
 
     
-    def _load_plugin(self, config:PluginConfig) -> Any:
+    def _import_modules(self, paths:List[str]) -> Dict[str, Any]:
+        """
+        Imports the given plugin modules in parallel, so their file reads and
+        bytecode compilation overlap. Modules that fail to import are left out,
+        _load_plugin reports their error.
+        """
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            return {}
+
+        if self.executor is not None:
+            futures = {path: self.executor.submit(importlib.import_module, path) for path in paths}
+            wait(futures.values())
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+                futures = {path: executor.submit(importlib.import_module, path) for path in paths}
+
+        return {
+            path: future.result()
+            for path, future in futures.items()
+            if future.exception() is None
+        }
+
+    def _load_plugin(self, config:PluginConfig, module:Optional[Any] = None) -> Any:
 
         try:
             
-            logger.info(f"Loading plugin module {config.name} ({config.classname})")
+            logger.info("Loading plugin module %s (%s)", config.name, config.classname)
 
-            module = importlib.import_module(config.path)
+            if module is None:
+                module = importlib.import_module(config.path)
             if not hasattr(module, config.classname):
                 raise AttributeError(f"Class {config.classname} not found in module {config.path}")
 
@@ -76,7 +119,7 @@ class PluginLoader:
 
 
         except Exception as e:
-            logger.error(f"Failed to load module {config.name}: {e}")
+            logger.error("Failed to load module %s: %s", config.name, e)
             return None
 
     
@@ -84,12 +127,17 @@ class PluginLoader:
 
         self.load_config()
 
+        modules = self._import_modules(
+            [config.path for config in self.plugin_configs if config.enabled]
+        )
+
+        # Instantiation touches shared state, so it stays sequential
         for config in self.plugin_configs:
             if not config.enabled:
-                logger.info(f"Skipping diabled plugin: {config.name}")
+                logger.info("Skipping diabled plugin: %s", config.name)
                 continue
 
-            plugin_instance = self._load_plugin(config)
+            plugin_instance = self._load_plugin(config, modules.get(config.path))
             if plugin_instance is not None:
                 self.loaded_plugins.update({
                     config.name : {
@@ -97,7 +145,7 @@ class PluginLoader:
                         "config": config
                     }
                 })
-                logger.info(f"Succesfully loaded plugin module: {config.name}")
+                logger.info("Succesfully loaded plugin module: %s", config.name)
         
         return self.loaded_plugins
         
@@ -1,15 +1,35 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, IO, Optional, List
 from pathlib import Path
 import tempfile
+import threading
 import os
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from file_version_tracker import FileVersionTracker
 
 # Import the global config to access PLUGIN_CONFIG_PATH
 
+# Size of the slices create_tmp_file_from_content hands to os.write, and of the
+# write buffer of create_tmp_file_from_writer
+TMP_FILE_WRITE_CHUNK_SIZE = 1024 * 1024
+
+# Keep-alive connections per host of the shared HTTP connection pool
+HTTP_POOL_SIZE = 32
+# Exhausted status retries hand back the last response, so callers (e.g. gspread)
+# still raise their own errors instead of requests' RetryError
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    raise_on_status=False,
+)
+
 
 @dataclass
 class PluginResult:
@@ -25,9 +45,37 @@ class PluginResult:
 
 class DocumentLoaderPlugin(ABC):
 
+    # Plugins dominated by network waits run on the shared thread pool. CPU heavy
+    # ones (e.g. document conversion) set this to False to run in a worker process,
+    # so the plugin instance and its result have to be picklable.
+    io_bound: bool = True
+
+    # One connection pool for the HTTP traffic of every plugin, so TLS handshakes
+    # are paid once per host instead of once per session. Created on first use.
+    _http_adapter: Optional[HTTPAdapter] = None
+    _http_lock = threading.Lock()
+
     def __init__(self):
         self.plugin_dir = Path(__file__).resolve().parent
 
+    @staticmethod
+    def mount_shared_adapter(session: requests.Session) -> requests.Session:
+        """
+        Mounts the shared pooled adapter on the given session, so sessions that
+        need their own auth (e.g. google.auth's AuthorizedSession) reuse the pool too.
+        """
+        with DocumentLoaderPlugin._http_lock:
+            if DocumentLoaderPlugin._http_adapter is None:
+                DocumentLoaderPlugin._http_adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_SIZE,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    max_retries=HTTP_RETRY,
+                )
+            adapter = DocumentLoaderPlugin._http_adapter
+
+        session.mount("https://", adapter)
+        return session
+
     def set_file_version_tracker(self, file_version_tracker:FileVersionTracker) -> 'DocumentLoaderPlugin':
         self.file_version_tracker = file_version_tracker
         return self
@@ -102,11 +150,49 @@ class DocumentLoaderPlugin(ABC):
         if not extension.startswith('.'):
             extension = '.' + extension
         
-        # Create a temporary file with the given extension
-        with tempfile.NamedTemporaryFile(mode='w', suffix=extension, delete=False, encoding='utf-8') as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
-        
+        # Encode once and write the bytes straight to the file descriptor,
+        # in slices so large documents do not need one huge kernel write
+        data = memoryview(content.encode('utf-8'))
+        fd, tmp_path = tempfile.mkstemp(suffix=extension)
+        try:
+            for offset in range(0, len(data), TMP_FILE_WRITE_CHUNK_SIZE):
+                chunk = data[offset:offset + TMP_FILE_WRITE_CHUNK_SIZE]
+                while chunk:
+                    written = os.write(fd, chunk)
+                    chunk = chunk[written:]
+        finally:
+            os.close(fd)
+
+        return tmp_path
+
+    def create_tmp_file_from_writer(self, writer:Callable[[IO[str]], bool], extension:str) -> Optional[str]:
+        """
+        Creates a temporary file filled by the given writer, so the content
+        is streamed to disk instead of being built in memory first.
+
+        :param writer: Called with the UTF-8 text file, returns False if it had nothing to write
+        :type writer: Callable[[IO[str]], bool]
+        :param extension: File extension (e.g., '.txt', '.pdf'). If not starting with dot, one will be added.
+        :type extension: str
+        :return: Path to the created temporary file, None if the writer had no content
+        :rtype: Optional[str]
+        """
+
+        if not extension.startswith('.'):
+            extension = '.' + extension
+
+        fd, tmp_path = tempfile.mkstemp(suffix=extension)
+        try:
+            with open(fd, 'w', encoding='utf-8', newline='', buffering=TMP_FILE_WRITE_CHUNK_SIZE) as tmp_file:
+                has_content = writer(tmp_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        if not has_content:
+            Path(tmp_path).unlink(missing_ok=True)
+            return None
+
         return tmp_path
 
     def create_result(self, success: bool, display_names: List[str] = None, file_paths: List[str] = None, **kwargs) -> PluginResult:
@@ -123,7 +209,7 @@ class DocumentLoaderPlugin(ABC):
 
     def should_process(self, filename: str, current_version: str) -> bool:
         """Check if new version is available"""
-        return self.file_version_tracker.is_new_version_available(filename, current_version)
+        return not self.file_version_tracker.is_current(filename, current_version)
 
 
     @abstractmethod
@@ -0,0 +1,107 @@
+"""
+Row formatting kernel of the migration tracker markdown.
+
+Kept free of plugin state so the hot loop only touches locals: the labels are
+rendered into line prefixes and the link fields are resolved once per call,
+not once per cell.
+"""
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+ITEM_ID_PREFIXES = ("item", "a-item", "legacy")
+URL_PREFIXES = ("http://", "https://")
+NOTES_IDX = 9  # Context/Notes column
+
+# Cell values treated as empty: "" and every casing of "nan" (pandas' missing value
+# rendering). A set lookup instead of lowering every cell.
+MISSING_VALUES = frozenset(
+    ["", "nan", "naN", "nAn", "nAN", "Nan", "NaN", "NAn", "NAN"]
+)
+
+
+def _is_link_field(label: str) -> bool:
+    # "URL" and "Link" fields render their http(s) values as clickable links
+    return "URL" in label or "Link" in label
+
+
+def format_rows(
+    rows: Iterable[List[str]],
+    meta_pairs: Sequence[Tuple[int, str]],
+    body_fields: Sequence[Tuple[int, str]],
+    write: Callable[[str], object],
+) -> None:
+    """
+    Writes the markdown of every item row through `write`.
+
+    Each section starts with the blank line closing the previous one, so an
+    item never ends with one, and items are separated by a `---` line.
+    """
+    meta = tuple((idx, f"- **{label}:** ") for idx, label in meta_pairs)
+    body = tuple(
+        (idx, f"- **{label}:** ", _is_link_field(label)) for idx, label in body_fields
+    )
+
+    # Fields present in rows of a given width. Worksheet rows all share one
+    # width, so this runs once and the cell loops need no bounds checks.
+    tables: Dict[int, Tuple[Tuple, Tuple]] = {}
+
+    write("\n")
+    separator = ""
+
+    for row in rows:
+        # Skip rows that don't look like valid items (e.g., empty or repeat headers)
+        item_id = row[0].strip() if row else ""
+        if not item_id or not item_id.lower().startswith(ITEM_ID_PREFIXES):
+            continue
+
+        n_cells = len(row)
+        table = tables.get(n_cells)
+        if table is None:
+            table = tables[n_cells] = (
+                tuple(field for field in meta if field[0] < n_cells),
+                tuple(field for field in body if field[0] < n_cells),
+            )
+        row_meta, row_body = table
+
+        write(separator)
+        separator = "\n---\n"
+
+        # --- A. Header Section ---
+        write("## " + item_id + "\n\n")
+
+        description = row[1].strip().replace("\n", " ") if n_cells > 1 else ""
+        if description:
+            write("**Issue Description:** " + description + "\n\n")
+
+        # --- B. Quick Status Section ---
+        write("### Status\n")
+        for idx, prefix in row_meta:
+            value = row[idx].strip()
+            if value:
+                write(prefix + value + "\n")
+
+        # --- C. Detailed Information Section ---
+        has_details = False
+        for idx, prefix, is_link_field in row_body:
+            value = row[idx].strip()
+            if value in MISSING_VALUES:
+                continue
+
+            if not has_details:
+                write("\n### Details\n")
+                has_details = True
+
+            if is_link_field and value.startswith(URL_PREFIXES):
+                write(prefix + "[" + value + "](" + value + ")\n")
+            else:
+                write(prefix + value + "\n")
+
+        # --- D. Context Section (for longer notes) ---
+        if NOTES_IDX < n_cells:
+            notes = row[NOTES_IDX].strip()
+            if notes not in MISSING_VALUES:
+                write("\n### Context\n\n")
+                # Preserve line breaks in notes
+                for note_line in notes.split("\n"):
+                    note_line = note_line.strip()
+                    if note_line:
+                        write("> " + note_line + "\n")
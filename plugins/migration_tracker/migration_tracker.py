@@ -1,14 +1,19 @@
-import gspread
-import google.auth
+import io
 import pprint
 import os
-import pandas as pd
+import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import IO, TYPE_CHECKING, Iterable, List, Optional, Tuple
 
 from plugins.document_loader_plugin import DocumentLoaderPlugin
+from plugins.migration_tracker._formatter import format_rows
 from file_version_tracker import FileVersionTracker 
 
+# gspread and google.auth are imported where they are used, loading the plugin does not pull them in
+if TYPE_CHECKING:
+    import gspread
+
 SHEET_ID = "1NJLdhSol4tqnIdeMg9uGSjC98h3V_sFGcAkAbJUBpp4"
 WORKSHEET_ID = "1406128683"
 TRACKED_FILENAME = "VCRM Migration - Tracker.md"
@@ -17,6 +22,14 @@ PLUGIN_PATH = Path(__file__).parent
 CREDNTIALS = str(
     (PLUGIN_PATH / "oca-agentic-rag-mig-helper-b39f9eb088cc.json").resolve()
 )
+SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+)
+
+# gspread client shared by every run in the process, created on first use
+_CLIENT_LOCK = threading.Lock()
+_CACHED_CLIENT: Optional["gspread.Client"] = None
 
 
 
@@ -51,28 +64,75 @@ HEADER_MAP = header_map = {
 META_FIELDS = [5, 3, 6, 7, 8]
 
 
+def _column_letter(idx: int) -> str:
+    """A1 column letters of a 0-based column index (0 -> A, 26 -> AA)"""
+    letters = ""
+    idx += 1
+    while idx:
+        idx, remainder = divmod(idx - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def _column_blocks(indexes: Iterable[int]) -> Tuple[Tuple[int, int, str], ...]:
+    """Contiguous runs of the given column indexes as (first index, last index, A1 columns)"""
+    runs = []
+    for idx in sorted(indexes):
+        if runs and runs[-1][1] == idx - 1:
+            runs[-1][1] = idx
+        else:
+            runs.append([idx, idx])
+    return tuple(
+        (first, last, f"{_column_letter(first)}:{_column_letter(last)}")
+        for first, last in runs
+    )
+
+
+# Column blocks holding the HEADER_MAP fields, currently A:S and AE:AI.
+# The stack flag columns between them are not downloaded.
+COLUMN_BLOCKS = _column_blocks(HEADER_MAP)
+
+# Field tables resolved once at import time instead of per row. The labels are
+# interned, the detail fields exclude the ones shown in the header and status.
+META_PAIRS = tuple((idx, sys.intern(HEADER_MAP.get(idx, "Meta"))) for idx in META_FIELDS)
+BODY_FIELDS = tuple(
+    (idx, sys.intern(label))
+    for idx, label in HEADER_MAP.items()
+    if idx not in (0, 1) and idx not in META_FIELDS
+)
+
+
 class MigrationTracker(DocumentLoaderPlugin):
     def __init__(self):
         super().__init__()
-        self.client: Optional[gspread.Client] = None
+        self.client: Optional["gspread.Client"] = None
         self.sheet = None
-        self.data = None
+        self.data: Optional[List[List[str]]] = None
 
     def get_gsheet_client(self) -> None:
-        try:
-            scopes = [
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive",
-            ]
+        global _CACHED_CLIENT
+
+        with _CLIENT_LOCK:
+            if _CACHED_CLIENT is None:
+                _CACHED_CLIENT = self._create_gsheet_client()
+            self.client = _CACHED_CLIENT
 
-            credentials, project = google.auth.default(scopes=scopes)
+    def _create_gsheet_client(self) -> "gspread.Client":
+        import google.auth
+        import gspread
+        from google.auth.transport.requests import AuthorizedSession
+
+        try:
+            credentials, project = google.auth.default(scopes=SCOPES)
 
             if not credentials:
                 raise ValueError("No Google credentials found")
 
             self.logger.info(f"Using credentials for project: {project}")
-            # Authorize with gspread
-            self.client = gspread.authorize(credentials)  # type: ignore
+            # Authorize with gspread, over the connection pool shared by the plugins.
+            # The AuthorizedSession refreshes the token itself once it expires.
+            session = self.mount_shared_adapter(AuthorizedSession(credentials))
+            return gspread.authorize(credentials, session=session)  # type: ignore
 
         except Exception as e:
             self.logger.error(
@@ -80,122 +140,89 @@ class MigrationTracker(DocumentLoaderPlugin):
             )
             raise
 
-    def get_sheet(self) -> None:
+    def get_last_update_time(self) -> str:
+        """Last modification time of the spreadsheet, read straight from the Drive API"""
+        import gspread
+
         if not self.client:
             raise ValueError("Google Sheets client not initialized")
 
         try:
-            sheet = self.client.open_by_key(SHEET_ID)
-            self.sheet = sheet
-        except gspread.exceptions.SpreadsheetNotFound as e:
+            return self.client.http_client.get_file_drive_metadata(SHEET_ID)["modifiedTime"]
+        except gspread.exceptions.APIError as e:
             self.logger.error(f"Spreadsheet can not be found or no permission: {e}")
             raise
+
+    def get_sheet(self) -> None:
+        """
+        Loads the values of the tracked worksheet into self.data.
+
+        Only the worksheet titles are requested from the spreadsheet metadata,
+        the values of the HEADER_MAP columns are then read with a single
+        values.batchGet call.
+        """
+        import gspread
+
+        if not self.client:
+            raise ValueError("Google Sheets client not initialized")
+
+        http_client = self.client.http_client
+        try:
+            metadata = http_client.fetch_sheet_metadata(
+                SHEET_ID, params={"fields": "sheets.properties(sheetId,title)"}
+            )
+            title = next(
+                (
+                    sheet["properties"]["title"]
+                    for sheet in metadata.get("sheets", [])
+                    if sheet["properties"]["sheetId"] == int(WORKSHEET_ID)
+                ),
+                None,
+            )
+            if title is None:
+                raise gspread.exceptions.WorksheetNotFound(f"id {WORKSHEET_ID} not found")
+
+            response = http_client.values_batch_get(
+                SHEET_ID,
+                [
+                    gspread.utils.absolute_range_name(title, columns)
+                    for _, _, columns in COLUMN_BLOCKS
+                ],
+            )
         except gspread.exceptions.APIError as e:
             self.logger.error(f"Google Sheets API error: {e}")
             raise
 
-    def convert_content(self) -> str:
-        if self.data is None:
-            return ""
+        blocks = [value_range.get("values", []) for value_range in response["valueRanges"]]
+        n_rows = max(len(values) for values in blocks)
+
+        # Stitch the blocks back into rows of the full width, empty cells in the
+        # skipped columns, so the HEADER_MAP indexes stay valid
+        rows = [[] for _ in range(n_rows)]
+        end = 0
+        for (first, last, _), values in zip(COLUMN_BLOCKS, blocks):
+            gap = [""] * (first - end)
+            for row, block_row in zip(
+                rows, gspread.utils.fill_gaps(values, rows=n_rows, cols=last - first + 1)
+            ):
+                row += gap
+                row += block_row
+            end = last + 1
+
+        self.data = rows
 
-        formatted_docs = []
+    def write_content(self, fp: IO[str]) -> bool:
+        """Writes the markdown of the loaded sheet to fp, False if no sheet is loaded"""
+        if self.data is None:
+            return False
 
-        # Iterate through the DataFrame
-        for _, row in self.data.iterrows():
-            # Clean the Item ID to ensure it's a valid row
-            item_id_raw = row.iloc[0] if not pd.isna(row.iloc[0]) else ""
-            item_id = str(item_id_raw).strip()
+        format_rows(self.data, META_PAIRS, BODY_FIELDS, fp.write)
+        return True
 
-            # Skip rows that don't look like valid items (e.g., empty or repeat headers)
-            if not item_id or not item_id.lower().startswith(
-                ("item", "a-item", "legacy")
-            ):
-                continue
-
-            doc_lines = []
-
-            # --- A. Header Section ---
-            doc_lines.append(f"## {item_id}")
-            doc_lines.append("")
-
-            # Get Description (Index 1)
-            desc_raw = row.iloc[1] if not pd.isna(row.iloc[1]) else ""
-            description = str(desc_raw).strip().replace("\n", " ")
-            if description:
-                doc_lines.append(f"**Issue Description:** {description}")
-                doc_lines.append("")
-
-            # --- B. Quick Status Section ---
-            doc_lines.append("### Status")
-            status_info = []
-            for idx in META_FIELDS:
-                if idx < len(row):
-                    val = row.iloc[idx]
-                    if not pd.isna(val) and str(val).strip():
-                        label = HEADER_MAP.get(idx, "Meta")
-                        clean_val = str(val).strip()
-                        status_info.append(f"- **{label}:** {clean_val}")
-
-            if status_info:
-                doc_lines.extend(status_info)
-            doc_lines.append("")
-
-            # --- C. Detailed Information Section ---
-            detailed_info = []
-            for idx, label in HEADER_MAP.items():
-                # Skip fields already handled in Header or Status sections
-                if idx in [0, 1] or idx in META_FIELDS:
-                    continue
-
-                if idx < len(row):
-                    val = row.iloc[idx]
-
-                    # Check for empty/NaN values
-                    if pd.isna(val):
-                        continue
-
-                    clean_val = str(val).strip()
-                    if not clean_val or clean_val.lower() == "nan":
-                        continue
-
-                    # Format URLs as clickable links
-                    if (
-                        "URL" in label
-                        or "Link" in label
-                        and clean_val.startswith(("http://", "https://"))
-                    ):
-                        detailed_info.append(
-                            f"- **{label}:** [{clean_val}]({clean_val})"
-                        )
-                    else:
-                        detailed_info.append(f"- **{label}:** {clean_val}")
-
-            if detailed_info:
-                doc_lines.append("### Details")
-                doc_lines.extend(detailed_info)
-                doc_lines.append("")
-
-            # --- D. Context Section (for longer notes) ---
-            notes_idx = 9  # Context/Notes column
-            if notes_idx < len(row):
-                notes_raw = row.iloc[notes_idx]
-                if not pd.isna(notes_raw) and str(notes_raw).strip():
-                    notes = str(notes_raw).strip()
-                    if notes and notes.lower() != "nan":
-                        doc_lines.append("### Context")
-                        doc_lines.append("")
-                        # Preserve line breaks in notes
-                        notes_lines = notes.split("\n")
-                        for note_line in notes_lines:
-                            if note_line.strip():
-                                doc_lines.append(f"> {note_line.strip()}")
-                        doc_lines.append("")
-
-            # Join the lines for this specific item
-            formatted_docs.append("\n".join(doc_lines))
-
-        # Join all items with a clear separator
-        return "\n" + ("\n" + "---" + "\n").join(formatted_docs)
+    def convert_content(self) -> str:
+        buf = io.StringIO()
+        self.write_content(buf)
+        return buf.getvalue()
 
     def run(self) -> "PluginResult":
         from plugins.document_loader_plugin import (PluginResult)  # Import here to avoid circular import
@@ -207,27 +234,20 @@ class MigrationTracker(DocumentLoaderPlugin):
 
         try:
             self.get_gsheet_client()
-            self.get_sheet()
 
-            if not self.sheet:
-                return self.create_result(
-                    success=False, error_message="Sheet not loaded"
-                )
-
-            sheet_last_update_time = self.sheet.get_lastUpdateTime()
+            # A single Drive call decides whether the sheet has to be read at all
+            sheet_last_update_time = self.get_last_update_time()
             self.logger.info(f"sheet last update date: {sheet_last_update_time}")
 
             if self.should_process(TRACKED_FILENAME, sheet_last_update_time):
                 self.logger.info("New version available, processing...")
-                worksheet = self.sheet.get_worksheet_by_id(WORKSHEET_ID)
-                worksheet_data = worksheet.get_all_values()
-                self.data = pd.DataFrame(worksheet_data)
-                content = self.convert_content()
-
-                if content:
-                    tmp_file_path = super().create_tmp_file_from_content(
-                        content=content, extension=".md"
-                    )
+                self.get_sheet()
+                # The markdown is streamed to the temp file, never held in memory as a whole
+                tmp_file_path = super().create_tmp_file_from_writer(
+                    self.write_content, extension=".md"
+                )
+
+                if tmp_file_path:
                     self.logger.info(f"Temp File Path: {tmp_file_path}")
                     # Update version tracker
                     #self.update_version_tracker(TRACKED_FILENAME, sheet_last_update_time)
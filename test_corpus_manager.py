@@ -0,0 +1,97 @@
+import os
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# config.config validates these on import
+for key, value in {
+    "DB_HOST": "localhost",
+    "DB_USER": "test",
+    "DB_PASS": "test",
+    "DB_NAME": "test",
+    "GCP_PROJECT_ID": "test-project",
+    "GCP_LOCATION": "us-central1",
+    "GCP_CORPUS_NAME": "projects/test-project/locations/us-central1/ragCorpora/1",
+}.items():
+    os.environ.setdefault(key, value)
+
+import corpus_manager  # noqa: E402
+
+
+def _page(*names):
+    return SimpleNamespace(
+        rag_files=[SimpleNamespace(display_name=name, name=f"files/{name}") for name in names]
+    )
+
+
+class TestCorpusManager(unittest.TestCase):
+    def setUp(self):
+        corpus_manager._files_index.clear()
+        corpus_manager._files_pages = None
+        corpus_manager._files_listing_done = False
+
+        self.rag = MagicMock()
+        self.fetched = []
+        for target, value in (
+            ("rag", self.rag),
+            ("_rate_limiter", MagicMock()),
+            ("init_vertexai", MagicMock()),
+        ):
+            patcher = patch.object(corpus_manager, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _listing(self, *pages, error=None):
+        def fetch():
+            for page in pages:
+                self.fetched.append(page)
+                yield page
+            if error is not None:
+                raise error
+
+        return MagicMock(pages=fetch())
+
+    def test_find_file_stops_at_first_match(self):
+        self.rag.list_files.return_value = self._listing(
+            _page("a.md", "b.md"), _page("c.md"), _page("d.md")
+        )
+
+        self.assertEqual(corpus_manager._find_file("b.md"), "files/b.md")
+        self.assertEqual(len(self.fetched), 1)
+        self.assertEqual(corpus_manager._find_file("c.md"), "files/c.md")
+        self.assertEqual(len(self.fetched), 2)
+        self.assertIsNone(corpus_manager._find_file("missing.md"))
+        self.assertEqual(len(self.fetched), 3)
+        self.assertIsNone(corpus_manager._find_file("other.md"))
+        self.rag.list_files.assert_called_once()
+
+    def test_find_file_restarts_listing_after_page_failure(self):
+        self.rag.list_files.side_effect = [
+            self._listing(_page("a.md"), error=ConnectionError("page fetch failed")),
+            self._listing(_page("a.md"), _page("b.md")),
+        ]
+
+        with self.assertRaises(ConnectionError):
+            corpus_manager._find_file("b.md")
+        self.assertEqual(corpus_manager._find_file("b.md"), "files/b.md")
+        self.assertEqual(self.rag.list_files.call_count, 2)
+
+    def test_upload_file_keeps_index_in_sync(self):
+        self.rag.list_files.return_value = self._listing(_page("doc.md"))
+        self.rag.upload_file.side_effect = [
+            SimpleNamespace(name="files/doc-2"),
+            SimpleNamespace(name="files/doc-3"),
+        ]
+
+        self.assertEqual(corpus_manager.upload_file(["doc.md"], ["doc.md"]), ["files/doc-2"])
+        self.rag.delete_file.assert_called_once_with(name="files/doc.md")
+        self.assertEqual(corpus_manager._files_index["doc.md"], "files/doc-2")
+
+        self.assertEqual(corpus_manager.upload_file(["doc.md"], ["doc.md"]), ["files/doc-3"])
+        self.rag.delete_file.assert_called_with(name="files/doc-2")
+        self.assertEqual(corpus_manager._files_index["doc.md"], "files/doc-3")
+        self.rag.list_files.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock, patch
+
+from file_version_tracker import FileVersionTracker
+
+TRACKED = datetime.datetime(2024, 5, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+class TestFileVersionTracker(unittest.TestCase):
+    def setUp(self):
+        self.cursor = MagicMock()
+        self.cursor.fetchone.return_value = (TRACKED,)
+        conn = MagicMock(prepared=True)
+        conn.cursor.return_value.__enter__.return_value = self.cursor
+
+        pool_patch = patch("file_version_tracker._TrackerPool")
+        schema_patch = patch.object(FileVersionTracker, "init_schema")
+        pool_class = pool_patch.start()
+        schema_patch.start()
+        self.addCleanup(pool_patch.stop)
+        self.addCleanup(schema_patch.stop)
+        pool_class.return_value.getconn.return_value = conn
+
+        self.tracker = FileVersionTracker({"DB_HOST": "localhost", "DB_POOL_MAX": 2})
+
+    def test_is_current_reads_version_once(self):
+        self.assertTrue(self.tracker.is_current("doc.md", "2024-04-01T00:00:00Z"))
+        self.assertTrue(self.tracker.is_current("doc.md", "2024-05-01T12:00:00+00:00"))
+        self.assertFalse(self.tracker.is_current("doc.md", "2024-06-01T00:00:00Z"))
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+    def test_is_current_naive_timestamp(self):
+        self.assertTrue(self.tracker.is_current("doc.md", "2024-05-01T11:59:59"))
+        self.assertFalse(self.tracker.is_current("doc.md", "2024-05-01T12:00:01"))
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+    def test_is_current_untracked_file(self):
+        self.cursor.fetchone.return_value = None
+        self.assertFalse(self.tracker.is_current("new.md", "2024-04-01T00:00:00Z"))
+        self.assertTrue(self.tracker.is_new_version_available("new.md", "2024-04-01T00:00:00Z"))
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+    def test_is_current_invalid_timestamp(self):
+        with self.assertRaises(RuntimeError):
+            self.tracker.is_current("doc.md", "yesterday")
+        self.cursor.execute.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import logging
+import unittest
+from unittest.mock import MagicMock
+
+from plugins.migration_tracker.migration_tracker import (
+    COLUMN_BLOCKS,
+    HEADER_MAP,
+    WORKSHEET_ID,
+    MigrationTracker,
+)
+
+# Width of the stitched rows: the last HEADER_MAP column plus one
+ROW_WIDTH = max(HEADER_MAP) + 1
+
+
+class TestMigrationTracker(unittest.TestCase):
+    def setUp(self):
+        self.http_client = MagicMock()
+        self.http_client.fetch_sheet_metadata.return_value = {
+            "sheets": [
+                {"properties": {"sheetId": 0, "title": "Other"}},
+                {"properties": {"sheetId": int(WORKSHEET_ID), "title": "Tracker"}},
+            ]
+        }
+        self.tracker = MigrationTracker().set_logger(logging.getLogger(__name__))
+        self.tracker.client = MagicMock(http_client=self.http_client)
+
+    def _set_blocks(self, *blocks):
+        self.http_client.values_batch_get.return_value = {
+            "valueRanges": [
+                {"range": columns} if values is None else {"range": columns, "values": values}
+                for (_, _, columns), values in zip(COLUMN_BLOCKS, blocks)
+            ]
+        }
+
+    def test_column_blocks_cover_header_map(self):
+        covered = {idx for first, last, _ in COLUMN_BLOCKS for idx in range(first, last + 1)}
+        self.assertEqual(covered, set(HEADER_MAP))
+        self.assertEqual(
+            [columns for _, _, columns in COLUMN_BLOCKS], ["A:S", "AE:AI"]
+        )
+
+    def test_get_sheet_requests_column_blocks(self):
+        self._set_blocks([["ITEM-1"]], [["x"]])
+
+        self.tracker.get_sheet()
+
+        self.http_client.values_batch_get.assert_called_once()
+        _, ranges = self.http_client.values_batch_get.call_args.args
+        self.assertEqual(ranges, ["'Tracker'!A:S", "'Tracker'!AE:AI"])
+
+    def test_get_sheet_ragged_rows(self):
+        self._set_blocks(
+            [["ITEM-1", "desc"], ["ITEM-2"], [], ["ITEM-4", "d", "r"]],
+            [["critical"], [], ["", "2024-01-01"]],
+        )
+
+        self.tracker.get_sheet()
+        rows = self.tracker.data
+
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(len(row) == ROW_WIDTH for row in rows))
+        self.assertEqual(rows[0][:2], ["ITEM-1", "desc"])
+        self.assertEqual(rows[0][30], "critical")
+        self.assertEqual(rows[1][0], "ITEM-2")
+        self.assertEqual(rows[2][31], "2024-01-01")
+        self.assertEqual(rows[3][:3], ["ITEM-4", "d", "r"])
+        # The skipped columns between the blocks are empty
+        self.assertTrue(all(cell == "" for row in rows for cell in row[19:30]))
+
+    def test_get_sheet_empty_second_block(self):
+        self._set_blocks([["ITEM-1", "desc"], ["ITEM-2"]], None)
+
+        self.tracker.get_sheet()
+        rows = self.tracker.data
+
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(all(len(row) == ROW_WIDTH for row in rows))
+        self.assertTrue(all(cell == "" for row in rows for cell in row[19:]))
+
+    def test_get_sheet_empty_sheet(self):
+        self._set_blocks(None, None)
+
+        self.tracker.get_sheet()
+
+        self.assertEqual(self.tracker.data, [])
+        self.assertEqual(self.tracker.convert_content(), "\n")
+
+
+if __name__ == "__main__":
+    unittest.main()